@@ -0,0 +1,245 @@
+# bench/fake_ats.py  –  local stand-in for the Greenhouse / Lever / Ashby /
+# Workday / Pushover endpoints Prefire talks to.
+#
+# Every request path is  /<real-host>/<real-path>  (see providers.ats_url), so
+# any slug / tenant is accepted and gets a deterministic synthetic board.
+#
+#   python bench/fake_ats.py --port 8765 --postings 200 --latency 0.05
+#   PREFIRE_ATS_BASE=http://127.0.0.1:8765 python sentinel.py
+
+import argparse, hashlib, json, random, re, threading, time, zlib
+from dataclasses import dataclass, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# --------------------------------------------------------------------------- #
+# Knobs
+# --------------------------------------------------------------------------- #
+@dataclass
+class FakeConfig:
+    postings: int      = 100           # postings per board
+    intern_ratio: float = 0.02         # share of titles that match _INTERN_RE
+    page_size: int     = 50            # Workday server-side page cap
+    latency: float     = 0.0           # seconds added to every response
+    error_rate: float  = 0.0           # share of 500s
+    rate_limit: float  = 0.0           # share of 429s (with Retry-After)
+    etag: bool         = True          # send ETag, answer If-None-Match with 304 –
+                                       # no provider sends If-None-Match, so 304s (and
+                                       # the not_modified stat) only show up for
+                                       # standalone clients; run_bench never sees one
+    workday_tiers: str = "get,post,spa"  # tiers a Workday tenant answers
+    seed: int          = 0
+
+# --------------------------------------------------------------------------- #
+# Synthetic boards
+# --------------------------------------------------------------------------- #
+_TITLES = ("Software Engineer", "Data Scientist", "Product Manager",
+           "Mechanical Engineer", "Account Executive", "Designer")
+
+def _board(key: str, cfg: FakeConfig):
+    """Deterministic [(id, title)] for one board."""
+    rng = random.Random(f"{cfg.seed}:{key}")
+    base = zlib.crc32(key.encode()) * 1000
+    out = []
+    for i in range(cfg.postings):
+        title = rng.choice(_TITLES)
+        if rng.random() < cfg.intern_ratio:
+            title += rng.choice((" Intern", " Internship", " Summer Internship"))
+        out.append((base + i, f"{title} {i}"))
+    return out
+
+def greenhouse(slug, cfg):
+    return {"jobs": [{"id": i, "title": t, "employment_type": "",
+                      "absolute_url": f"https://boards.greenhouse.io/{slug}/jobs/{i}"}
+                     for i, t in _board("gh:" + slug, cfg)],
+            "meta": {"total": cfg.postings}}
+
+def lever(org, cfg):
+    return [{"id": f"{org}-{i}", "text": t,
+             "hostedUrl": f"https://jobs.lever.co/{org}/{i}"}
+            for i, t in _board("lv:" + org, cfg)]
+
+def ashby(slug, cfg):
+    return {"apiVersion": "1",
+            "jobs": [{"id": f"{slug}-{i}", "title": t,
+                      "applyUrl": f"https://jobs.ashbyhq.com/{slug}/{i}"}
+                     for i, t in _board("ab:" + slug, cfg)]}
+
+def workday(tenant, site, offset, limit, cfg):
+    rows = _board(f"wd:{tenant}/{site}", cfg)
+    page = rows[offset:offset + min(limit, cfg.page_size)]
+    return {"total": len(rows),
+            "jobPostings": [{"title": t, "jobPostingId": str(i),
+                             "externalPath": f"/job/Remote/{i}"} for i, t in page]}
+
+_SPA = """<!doctype html><html><head><title>Careers</title></head><body>
+<div id="app">loading…</div>
+<script>
+fetch("%s", {method: "POST", headers: {"Content-Type": "application/json"},
+             body: JSON.stringify({appliedFacets: {}, limit: 20, offset: 0, searchText: ""})})
+  .then(r => r.json())
+  .then(d => { document.getElementById("app").textContent = d.jobPostings.length + " jobs"; });
+</script></body></html>"""
+
+_WD_HOST = re.compile(r"^([^.]+)\.([^.]+)\.myworkdayjobs\.com$")
+
+# --------------------------------------------------------------------------- #
+# Server
+# --------------------------------------------------------------------------- #
+class FakeATS(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, cfg: FakeConfig):
+        super().__init__(addr, _Handler)
+        self.cfg   = cfg
+        self.rng   = random.Random(cfg.seed)
+        self.lock  = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {"requests": 0, "bytes": 0, "errors": 0, "throttled": 0,
+                          "not_modified": 0, "notifications": 0, "by_host": {}}
+
+    def snapshot(self):
+        with self.lock:
+            return json.loads(json.dumps(self.stats))
+
+    def count(self, host, nbytes, status):
+        with self.lock:
+            s = self.stats
+            s["requests"] += 1
+            s["bytes"]    += nbytes
+            s["by_host"][host] = s["by_host"].get(host, 0) + 1
+            if status == 429:   s["throttled"] += 1
+            elif status == 304: s["not_modified"] += 1
+            elif status >= 500: s["errors"] += 1
+
+    def roll(self, p):
+        with self.lock:
+            return self.rng.random() < p
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_):        # keep the benchmark output clean
+        pass
+
+    def do_GET(self):  self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+
+    def _dispatch(self, method):
+        srv, cfg = self.server, self.server.cfg
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        path = "/" + path
+        query = parse_qs(parts.query)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        if host == "_stats":
+            return self._send(host, 200, srv.snapshot())
+        if host == "_reset":
+            srv.reset()
+            return self._send(host, 200, {})
+        if host == "api.pushover.net":
+            with srv.lock:
+                srv.stats["notifications"] += 1
+            return self._send(host, 200, {"status": 1})
+
+        if cfg.latency:
+            time.sleep(cfg.latency)
+        if srv.roll(cfg.rate_limit):
+            return self._send(host, 429, {"error": "rate limited"}, {"Retry-After": "1"})
+        if srv.roll(cfg.error_rate):
+            return self._send(host, 500, {"error": "boom"})
+
+        payload = self._route(method, host, path, query, body)
+        if payload is None:
+            return self._send(host, 404, {"error": "not found"})
+        if isinstance(payload, str):
+            return self._send(host, 200, payload.encode(), ctype="text/html")
+        return self._send(host, 200, payload)
+
+    def _route(self, method, host, path, query, body):
+        cfg = self.server.cfg
+        seg = path.strip("/").split("/")
+        if host == "boards-api.greenhouse.io" and seg[:2] == ["v1", "boards"] and len(seg) >= 4:
+            return greenhouse(seg[2], cfg)
+        if host == "api.lever.co" and seg[:2] == ["v0", "postings"] and len(seg) >= 3:
+            return lever(seg[2], cfg)
+        if host == "api.ashbyhq.com" and seg[:2] == ["posting-api", "job-board"] and len(seg) >= 3:
+            return ashby(seg[2], cfg)
+
+        m = _WD_HOST.match(host)
+        if not m:
+            return None
+        tiers = cfg.workday_tiers.split(",")
+        if seg[:2] == ["wday", "cxs"] and len(seg) == 5:
+            tenant, site, leaf = seg[2], seg[3], seg[4]
+            if leaf == "getJobs" and method == "GET" and "get" in tiers:
+                return workday(tenant, site, int(query.get("$skip", ["0"])[0]),
+                               int(query.get("$top", ["50"])[0]), cfg)
+            from_browser = not self.headers.get("User-Agent", "").startswith("python-")
+            if leaf == "jobs" and method == "POST" and ("post" in tiers or
+                                                         ("spa" in tiers and from_browser)):
+                req = json.loads(body or b"{}")
+                return workday(tenant, site, int(req.get("offset", 0)),
+                               int(req.get("limit", 20)), cfg)
+            return None
+        if method == "GET" and "spa" in tiers and seg and seg[-1]:
+            # /<locale>/<site>  or  /<site>
+            site = seg[-1]
+            return _SPA % f"/{host}/wday/cxs/{m.group(1)}/{site}/jobs"
+        return None
+
+    def _send(self, host, status, payload, headers=None, ctype="application/json"):
+        data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        tag = '"%s"' % hashlib.md5(data).hexdigest()
+        if (status == 200 and self.server.cfg.etag and host not in ("_stats", "_reset")
+                and self.headers.get("If-None-Match") == tag):
+            status, data = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        if self.server.cfg.etag and status in (200, 304):
+            self.send_header("ETag", tag)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        if host not in ("_stats", "_reset", "api.pushover.net"):
+            self.server.count(host, len(data), status)
+
+def serve(cfg: FakeConfig, host="127.0.0.1", port=0) -> FakeATS:
+    """Start the stand-in on a background thread and return it."""
+    srv = FakeATS((host, port), cfg)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+def add_config_args(ap: argparse.ArgumentParser):
+    for k, v in asdict(FakeConfig()).items():
+        flag = "--" + k.replace("_", "-")
+        if isinstance(v, bool):
+            ap.add_argument(flag, type=lambda s: s.lower() in ("1", "true", "yes", "on"), default=v)
+        else:
+            ap.add_argument(flag, type=type(v), default=v)
+
+def config_from_args(args) -> FakeConfig:
+    return FakeConfig(**{k: getattr(args, k) for k in asdict(FakeConfig())})
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local ATS stand-in for benchmarks")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_config_args(ap)
+    args = ap.parse_args()
+    srv = FakeATS((args.host, args.port), config_from_args(args))
+    print(f"fake ATS on {srv.base_url}  (stats: {srv.base_url}/_stats)")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,206 @@
+# bench/run_bench.py  –  offline end-to-end benchmark for sentinel.py.
+#
+# Spins up bench/fake_ats.py, writes a synthetic watchers.json into a scratch
+# PREFIRE_HOME, runs sentinel.py against it as a child process and reports
+# wall time, requests, bytes, peak RSS and notifications per scenario.
+#
+#   python bench/run_bench.py                       # 10 / 500 / 5000 boards
+#   python bench/run_bench.py --boards 50 --postings 400 --latency 0.02
+#   python bench/run_bench.py --json bench_output.json
+#   python bench/run_bench.py --startup-only        # cold-start budget check
+#   python bench/run_bench.py --boards 500 --workers 1 4 --latency 0.05
+
+import argparse, json, os, pathlib, subprocess, sys, tempfile, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from fake_ats import serve, add_config_args, config_from_args
+
+ROOT     = pathlib.Path(__file__).resolve().parent.parent
+SENTINEL = ROOT / "sentinel.py"
+MIX      = ("Greenhouse", "Lever", "Ashby", "Workday")     # round-robin ATS mix
+STARTUP_BUDGET_MS = 80           # import time before the first fetch
+HEAVY    = ("playwright", "httpx", "tkinter")                # reported if imported
+# loaded lazily on the first request – counted in imports_ms, not startup_ms
+FETCH_STACK = ("httpx", "httpcore", "h11", "h2", "anyio", "sniffio", "certifi",
+               "idna", "ssl", "playwright")
+
+def make_watchers(n: int, mix=MIX) -> dict:
+    out = {}
+    for i in range(n):
+        ats = mix[i % len(mix)]
+        if ats.startswith("Workday"):
+            out[f"wd{i}"] = {"ats": ats, "tenant": f"tenant{i}", "cluster": "wd5",
+                             "site": "External", "locale": "en-US"}
+        else:
+            out[f"{ats.lower()}{i}"] = {"ats": ats, "slug": f"{ats.lower()}{i}"}
+    return out
+
+def _wait(proc):
+    """Wait for `proc`; return (returncode, peak RSS in MB or None)."""
+    if not hasattr(os, "wait4"):                       # Windows
+        return proc.wait(), None
+    _, status, ru = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = ru.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return proc.returncode, round(rss, 1)
+
+def _env(srv, home):
+    return dict(os.environ,
+                PREFIRE_HOME=str(home),
+                PREFIRE_ATS_BASE=srv.base_url,
+                PREFIRE_PUSHOVER_URL=f"{srv.base_url}/api.pushover.net/1/messages.json",
+                PUSHOVER_APP_TOKEN="bench", PUSHOVER_USER_KEY="bench")
+
+def run_scenario(srv, boards: int, mix=MIX, runs: int = 1, workers: int = 1) -> dict:
+    """
+    Run sentinel.py `runs` times over `boards` synthetic boards (fresh state).
+    With workers > 1 that many sharded workers run side by side on one lease
+    store; peak RSS is then the largest worker's.
+    """
+    with tempfile.TemporaryDirectory(prefix="prefire-bench-") as home:
+        home = pathlib.Path(home)
+        (home / "watchers.json").write_text(json.dumps(make_watchers(boards, mix)))
+        env = _env(srv, home)
+        cmds = [[sys.executable, str(SENTINEL)]]
+        if workers > 1:
+            sys.path.insert(0, str(ROOT))
+            import shards
+            db = home / "leases.db"
+            for i in range(workers):             # register everyone up front so
+                st = shards.LeaseStore(db, f"w{i}")  # run 1 already sees the full ring
+                st.heartbeat(); st.close()
+            cmds = [[sys.executable, str(SENTINEL), "--shard-db", str(db), "--worker-id", f"w{i}"]
+                    for i in range(workers)]
+        results = []
+        for run in range(runs):
+            srv.reset()
+            t0 = time.perf_counter()
+            # stderr goes to temp files, not pipes: a chatty worker (warnings,
+            # Chromium noise, long tracebacks) would block on a full pipe
+            errs = [tempfile.TemporaryFile() for _ in cmds]
+            procs = [subprocess.Popen(c, env=env, cwd=home, stdout=subprocess.DEVNULL,
+                                      stderr=e) for c, e in zip(cmds, errs)]
+            waited = [_wait(p) for p in procs]
+            wall = time.perf_counter() - t0
+            stats = srv.snapshot()
+            code = max(c for c, _ in waited)
+            rss = max((r for _, r in waited if r is not None), default=None)
+            err = []
+            for e in errs:
+                e.seek(0)
+                err.append(e.read().decode(errors="replace").strip())
+                e.close()
+            err = "\n".join(err)
+            results.append({
+                "boards": boards, "workers": workers, "run": run + 1, "exit": code,
+                "wall_s": round(wall, 3), "requests": stats["requests"],
+                "bytes": stats["bytes"], "peak_rss_mb": rss,
+                "notifications": stats["notifications"],
+                "errors": stats["errors"], "throttled": stats["throttled"],
+                "stderr": err[-500:] if code else "",
+            })
+        return results
+
+def parse_importtime(stderr: str):
+    """`-X importtime` output → [(module, cumulative_us)] for top-level imports."""
+    top = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumul, name = line[len("import time:"):].split("|")
+        name = name[1:]
+        if not name.startswith(" "):
+            top.append((name.strip(), int(cumul)))
+    return top
+
+def run_startup(srv, budget_ms: float = STARTUP_BUDGET_MS) -> dict:
+    """
+    Cold start of a one-board Greenhouse-only sentinel run under
+    `python -X importtime`: start-up import time (everything but the lazily
+    loaded fetch stack) against the budget, total import time, heaviest
+    imports, and which heavy dependencies got loaded at all.
+    """
+    with tempfile.TemporaryDirectory(prefix="prefire-startup-") as home:
+        home = pathlib.Path(home)
+        (home / "watchers.json").write_text(json.dumps(make_watchers(1, ("Greenhouse",))))
+        t0 = time.perf_counter()
+        res = subprocess.run([sys.executable, "-X", "importtime", str(SENTINEL), "--metrics", ""],
+                             env=_env(srv, home), cwd=home, capture_output=True, text=True)
+        wall = time.perf_counter() - t0
+    top = parse_importtime(res.stderr)
+    total_ms = sum(us for _, us in top) / 1000
+    startup_ms = sum(us for m, us in top if m.split(".")[0] not in FETCH_STACK) / 1000
+    every = {line.split("|")[-1].strip() for line in res.stderr.splitlines()
+             if line.startswith("import time:")}
+    return {
+        "exit": res.returncode, "wall_ms": round(wall * 1000, 1),
+        "startup_ms": round(startup_ms, 1), "imports_ms": round(total_ms, 1),
+        "budget_ms": budget_ms, "within_budget": startup_ms <= budget_ms,
+        "heaviest": [(m, round(us / 1000, 1)) for m, us in
+                     sorted(top, key=lambda t: -t[1])[:8]],
+        "heavy_loaded": sorted(h for h in HEAVY if h in every),
+    }
+
+def _print_startup(st):
+    print(f"cold start (1 Greenhouse board): wall {st['wall_ms']} ms, "
+          f"start-up imports {st['startup_ms']} ms / budget {st['budget_ms']} ms "
+          f"→ {'OK' if st['within_budget'] else 'OVER BUDGET'} "
+          f"(all imports incl. fetch stack {st['imports_ms']} ms)")
+    print("  heavy deps loaded: " + (", ".join(st["heavy_loaded"]) or "none"))
+    for m, ms in st["heaviest"]:
+        print(f"  {ms:8.1f} ms  {m}")
+
+def _table(rows):
+    cols = ("boards", "workers", "run", "wall_s", "requests", "bytes", "peak_rss_mb",
+            "notifications", "errors", "throttled", "exit")
+    width = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in cols}
+    lines = ["  ".join(c.rjust(width[c]) for c in cols)]
+    lines += ["  ".join(str(r[c]).rjust(width[c]) for c in cols) for r in rows]
+    return "\n".join(lines)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Offline sentinel.py benchmark")
+    ap.add_argument("--boards", type=int, nargs="+", default=[10, 500, 5000],
+                    help="board counts, one scenario each")
+    ap.add_argument("--mix", default=",".join(MIX),
+                    help="comma-separated ATS round-robin (add WorkdayIntercept "
+                         "to exercise the Playwright tier)")
+    ap.add_argument("--runs", type=int, default=1,
+                    help="back-to-back runs per scenario (run 2+ shows dedup)")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1],
+                    help="sharded worker counts to try per scenario (1 = plain run)")
+    ap.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    ap.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    ap.add_argument("--startup-only", action="store_true",
+                    help="only run the -X importtime cold-start check")
+    add_config_args(ap)
+    args = ap.parse_args(argv)
+
+    srv = serve(config_from_args(args))
+    mix = tuple(a.strip() for a in args.mix.split(",") if a.strip())
+    rows, startup = [], None
+    try:
+        startup = run_startup(srv, args.startup_budget_ms)
+        scenarios = [] if args.startup_only else args.boards
+        for n, w in ((n, w) for n in scenarios for w in args.workers):
+            res = run_scenario(srv, n, mix, args.runs, w)
+            rows += res
+            for r in res:
+                if r["exit"]:
+                    print(f"[WARN] {n} boards × {w} workers: sentinel exited {r['exit']}\n"
+                          f"{r['stderr']}", file=sys.stderr)
+    finally:
+        srv.shutdown()
+
+    _print_startup(startup)
+    if rows:
+        print(_table(rows))
+    if args.json:
+        pathlib.Path(args.json).write_text(json.dumps({"startup": startup, "scenarios": rows},
+                                                      indent=2))
+    ok = startup["exit"] == 0 and startup["within_budget"]
+    return 0 if ok and all(r["exit"] == 0 for r in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# bulk_import.py  –  add many job boards to watchers.json in one go.
+#
+#   python bulk_import.py careers.txt                 # one URL per line
+#   python bulk_import.py careers.txt --jobs 32 --intercept --report report.csv
+#
+# Each URL is classified with the same patterns as the GUI's Auto Detect.
+# Boards that are already in watchers.json (same ATS family + slug, or same
+# Workday tenant / cluster / site) are reported as duplicates without being
+# probed. The rest are probed concurrently (bounded thread pool) to confirm
+# the slug / tenant / site answers and, for Workday, which tier works.
+# Validated entries are written to watchers.json in a single batch.
+
+import argparse, csv, json, os, pathlib, re, sys, threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Tuple
+
+from providers import build_provider
+
+HOME = pathlib.Path(os.getenv("PREFIRE_HOME") or pathlib.Path(__file__).parent)
+CFG  = HOME / "watchers.json"
+
+INTERCEPT_SLOTS = threading.Semaphore(2)    # head-less browsers at once
+
+# --------------------------------------------------------------------------- #
+# Classification (shared with watchers_gui.auto_extract)
+# --------------------------------------------------------------------------- #
+_GREENHOUSE = re.compile(r"https?://boards\.greenhouse\.io/([^/]+)/?")
+_LEVER      = re.compile(r"https?://jobs\.lever\.co/([^/]+)/?")
+_ASHBY      = re.compile(r"https?://([^/]+)\.ashbyhq\.com/job_board/([^/]+)")
+_WORKDAY    = re.compile(r"https?://([^.]+)\.([^.]+)\.myworkdayjobs\.com/([^/]+)?/?([^/?#]+)?")
+
+def classify_url(url: str) -> Tuple[str, Dict[str, Any]] | None:
+    """Board URL → (suggested name, watchers.json entry), or None if unknown."""
+    url = url.strip()
+    if m := _GREENHOUSE.match(url):
+        return m.group(1).capitalize(), {"ats": "Greenhouse", "slug": m.group(1)}
+    if m := _LEVER.match(url):
+        return m.group(1).capitalize(), {"ats": "Lever", "slug": m.group(1)}
+    if m := _ASHBY.match(url):
+        return m.group(2).capitalize(), {"ats": "Ashby", "slug": m.group(2)}
+    if m := _WORKDAY.match(url):
+        tenant, cluster, p3, p4 = m.groups()
+        site, locale = "External", "en-US"
+        if p4 and p3: locale, site = p3, p4
+        elif p3:      site = p3
+        return tenant.upper(), {"ats": "Workday", "tenant": tenant, "cluster": cluster,
+                                "site": site, "locale": locale}
+    return None
+
+def board_key(info: Dict[str, Any]) -> Tuple[str, ...]:
+    """
+    Which board an entry watches, ignoring tier (Workday / WorkdayIntercept),
+    locale, key order and any extra keys.
+    """
+    ats = info.get("ats", "")
+    if ats.startswith("Workday"):
+        return ("Workday",) + tuple(str(info.get(k, "")).lower()
+                                    for k in ("tenant", "cluster", "site"))
+    return (ats, str(info.get("slug", "")).lower())
+
+# --------------------------------------------------------------------------- #
+# Probing
+# --------------------------------------------------------------------------- #
+def probe(name: str, info: Dict[str, Any], intercept: bool = False) -> Dict[str, Any]:
+    """
+    Confirm the board answers. Workday entries also try the default
+    "External" site and settle on the tier that worked (intercept →
+    WorkdayIntercept). Returns the validated entry; raises otherwise.
+    """
+    if info["ats"] != "Workday":
+        build_provider(name, info).probe()
+        return info
+    errors = []
+    for site in dict.fromkeys((info["site"], "External")):
+        cand = {**info, "site": site}
+        prov = build_provider(name, cand)
+        try:
+            tier = prov.probe(intercept, INTERCEPT_SLOTS)
+        except LookupError as e:
+            errors.append(str(e))
+            continue
+        return {**cand, "ats": "WorkdayIntercept" if tier == "intercept" else "Workday"}
+    raise LookupError("; ".join(errors))
+
+def _check(row: Dict[str, Any], info: Dict[str, Any], intercept: bool) -> Dict[str, Any] | None:
+    """Probe one classified board, filling in `row`; the validated entry or None."""
+    try:
+        info = probe(row["name"], info, intercept)
+    except Exception as e:
+        row["status"], row["detail"] = "failed", f"{type(e).__name__}: {e}"
+        return None
+    row["status"], row["ats"] = "ok", info["ats"]
+    return info
+
+def read_urls(lines: Iterable[str]) -> List[str]:
+    """One URL per line (first comma / whitespace field); blanks and #comments skipped."""
+    out = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            out.append(re.split(r"[,\s]", line, maxsplit=1)[0])
+    return list(dict.fromkeys(out))
+
+# --------------------------------------------------------------------------- #
+# Batch
+# --------------------------------------------------------------------------- #
+def _load_cfg(cfg_path: pathlib.Path) -> Dict[str, Any]:
+    txt = cfg_path.read_text().strip() if cfg_path.exists() else ""
+    return json.loads(txt) if txt else {}
+
+def bulk_import(urls: Iterable[str], cfg_path=CFG, jobs: int = 16,
+                intercept: bool = False, dry_run: bool = False,
+                progress=None) -> List[Dict[str, Any]]:
+    """
+    Classify `urls`, skip boards already watched (or listed twice), probe the
+    rest with at most `jobs` in flight, then merge every validated entry into
+    `cfg_path` with one write. Returns one report row per URL
+    (status: ok / duplicate / unknown / failed).
+    """
+    cfg_path = pathlib.Path(cfg_path)
+    known = {board_key(v): "already watched" for v in _load_cfg(cfg_path).values()}
+    report, todo = [], []
+    for url in urls:
+        hit = classify_url(url)
+        row = {"url": url, "status": "unknown", "name": "", "ats": "", "detail": "no ATS pattern matched"}
+        report.append(row)
+        if hit:
+            (row["name"], info), key = hit, board_key(hit[1])
+            row.update(ats=info["ats"], detail="")
+            if key not in known:
+                known[key] = f"same board as {url}"
+                todo.append((row, info))
+                continue
+            row["status"], row["detail"] = "duplicate", known[key]
+        if progress:
+            progress(row)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        validated = []
+        for (row, _), info in zip(todo, pool.map(lambda t: _check(*t, intercept), todo)):
+            validated.append((row, info))
+            if progress:
+                progress(row)
+
+    cfg = _load_cfg(cfg_path)                   # re-read: probing can take a while
+    known = {board_key(v) for v in cfg.values()}
+    for row, info in validated:
+        if info is None:
+            continue
+        key = board_key(info)                   # Workday may have moved to "External"
+        if key in known:
+            row["status"], row["detail"] = "duplicate", "already watched"
+            continue
+        name, n = row["name"], 2
+        while name in cfg:                      # same name, different board
+            name, n = f"{row['name']} {n}", n + 1
+        row["name"] = name
+        cfg[name] = info
+        known.add(key)
+
+    if not dry_run and any(r["status"] == "ok" for r in report):
+        tmp = cfg_path.with_name(cfg_path.name + ".tmp")
+        tmp.write_text(json.dumps(cfg, indent=2))
+        os.replace(tmp, cfg_path)
+    return report
+
+REPORT_COLS = ("status", "name", "ats", "url", "detail")
+
+def format_report(report: List[Dict[str, Any]]) -> str:
+    counts = {}
+    for r in report:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    lines = [f"{r['status']:<9} {r['ats']:<16} {r['name']:<24} {r['url']}"
+             + (f"  ({r['detail']})" if r["detail"] else "") for r in report]
+    lines.append(", ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    return "\n".join(lines)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Bulk-add job boards to watchers.json")
+    ap.add_argument("file", help="text/CSV file with one career-board URL per line ('-' = stdin)")
+    ap.add_argument("--watchers", default=str(CFG), help="watchers.json to update")
+    ap.add_argument("--jobs", type=int, default=16, help="probes in flight (default 16)")
+    ap.add_argument("--intercept", action="store_true",
+                    help="fall back to the Playwright intercept tier for Workday boards")
+    ap.add_argument("--dry-run", action="store_true", help="probe and report only")
+    ap.add_argument("--report", metavar="CSV", help="write the per-URL report as CSV")
+    args = ap.parse_args(argv)
+
+    src = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8-sig")
+    with src:
+        urls = read_urls(src)
+    report = bulk_import(urls, args.watchers, args.jobs, args.intercept, args.dry_run)
+    print(format_report(report).encode("ascii", errors="replace").decode())
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=REPORT_COLS, extrasaction="ignore")
+            w.writeheader(); w.writerows(report)
+    return 0 if all(r["status"] in ("ok", "duplicate") for r in report) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
-import httpx, os
+import os
 from dotenv import load_dotenv
 
 load_dotenv()                       # pulls secrets from .env in same folder
+PUSHOVER_URL = os.getenv("PREFIRE_PUSHOVER_URL", "https://api.pushover.net/1/messages.json")
 
 def push(message: str):
+    import httpx                    # only runs that actually alert pay for it
     httpx.post(
-        "https://api.pushover.net/1/messages.json",
+        PUSHOVER_URL,
         data={
             "token":  os.getenv("PUSHOVER_APP_TOKEN"),
             "user":   os.getenv("PUSHOVER_USER_KEY"),
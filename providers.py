@@ -1,75 +1,321 @@
 # providers.py
-import re, httpx
-from typing import Iterator, Dict, Any, List
-from playwright.sync_api import sync_playwright, TimeoutError
+#
+# Kept import-light on purpose: httpx is imported on the first request and
+# Playwright only when an intercept tier actually runs, so sentinel / GUI
+# start-up never pays for them up front (see bench/run_bench.py --startup).
+from __future__ import annotations
+import abc, contextlib, re, os, sys, json, time
+from dataclasses import dataclass, field, asdict
+from typing import TYPE_CHECKING, Iterator, Iterable, NamedTuple, Dict, Any, List
+
+if TYPE_CHECKING:
+    import httpx
 
 # --------------------------------------------------------------------------- #
 # Shared helpers
 # --------------------------------------------------------------------------- #
 _INTERN_RE = re.compile(r"\bIntern(ship)?s?\b", re.I)
+_DECODER   = json.JSONDecoder()
+_WS        = " \t\r\n"
+# Point every ATS endpoint at a local stand-in (bench/fake_ats.py):
+#   https://<host>/<path>  →  $PREFIRE_ATS_BASE/<host>/<path>
+ATS_BASE   = os.getenv("PREFIRE_ATS_BASE", "").rstrip("/")
+
+def ats_url(host: str, path: str) -> str:
+    return f"{ATS_BASE}/{host}{path}" if ATS_BASE else f"https://{host}{path}"
+
+# --------------------------------------------------------------------------- #
+# Per-watcher run metrics + instrumented HTTP
+# --------------------------------------------------------------------------- #
+@dataclass
+class RunStats:
+    """What one watcher did during one sentinel run (one metrics.jsonl line)."""
+    watcher: str = ""
+    ats: str = ""
+    wall_s: float = 0.0
+    tiers: List[str] = field(default_factory=list)   # Workday tiers attempted
+    tier: str = ""                                   # …and the one that produced rows
+    requests: int = 0
+    bytes: int = 0                                   # as downloaded (compressed if gzip)
+    retries: int = 0
+    rows_fetched: int = 0                            # decoded from the board
+    rows_matched: int = 0                            # survived intern + extra filter
+    notified: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+_RETRY_STATUS = (429, 503)
+MAX_RETRIES   = 2
+
+def _retry_after(r: httpx.Response) -> float:
+    try:
+        return min(float(r.headers.get("Retry-After", 1)), 10.0)
+    except ValueError:
+        return 1.0
+
+def http(method: str, url: str, stats: RunStats | None = None, **kw) -> httpx.Response:
+    """One request with bounded 429/503 back-off, tallied into `stats`."""
+    import httpx
+    stats = stats or RunStats()
+    for attempt in range(MAX_RETRIES + 1):
+        r = httpx.request(method, url, **kw)
+        stats.requests += 1
+        stats.bytes    += r.num_bytes_downloaded
+        if r.status_code not in _RETRY_STATUS or attempt == MAX_RETRIES:
+            return r
+        stats.retries += 1
+        time.sleep(_retry_after(r))
+
+def iter_json_array(chunks: Iterable[str], key: str | None = None) -> Iterator[Any]:
+    """
+    Incrementally decode a JSON body and yield the items of its array one by
+    one – either the top-level array or ``body[key]`` for an object body.
+    Only the item being decoded (plus one network chunk) is held in memory.
+    """
+    chunks = iter(chunks)
+    buf, pos, eof = "", 0, False
+
+    def more():
+        nonlocal buf, pos, eof
+        try:
+            buf = buf[pos:] + next(chunks)
+        except StopIteration:
+            buf, eof = buf[pos:], True
+        pos = 0
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            more()
+
+    def expect(ch):
+        nonlocal pos
+        skip_ws()
+        if pos >= len(buf) or buf[pos] != ch:
+            raise ValueError(f"expected {ch!r} in JSON body")
+        pos += 1
+
+    def peek(ch):
+        skip_ws()
+        return pos < len(buf) and buf[pos] == ch
+
+    def value():
+        # strings / objects / arrays end on their own closing character; a
+        # scalar (1.5, true, …) only once a delimiter follows it or the body
+        # ends – otherwise "1." + ".5" would decode as 1
+        nonlocal pos
+        while True:
+            skip_ws()
+            try:
+                obj, end = _DECODER.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                nxt = end
+                while nxt < len(buf) and buf[nxt] in _WS:
+                    nxt += 1
+                if eof or buf[pos] in '{["' or (nxt < len(buf) and buf[nxt] in ",]}:"):
+                    pos = end
+                    return obj
+            more()
+
+    if key is not None:
+        expect("{")
+        if peek("}"):
+            return                                      # empty object
+        while True:
+            name = value()
+            expect(":")
+            if name == key:
+                break
+            value()                                     # skip unrelated field
+            if peek("}"):
+                return                                  # key not present
+            expect(",")
+
+    expect("[")
+    if peek("]"):
+        return
+    while True:
+        yield value()
+        if peek("]"):
+            return
+        expect(",")
+
+def stream_json(url: str, key: str | None = None, timeout: float = 15,
+                stats: RunStats | None = None) -> Iterator[Any]:
+    """GET ``url`` and stream-decode the items of its job array."""
+    import httpx
+    stats = stats or RunStats()
+    for attempt in range(MAX_RETRIES + 1):
+        with httpx.stream("GET", url, timeout=timeout) as r:
+            stats.requests += 1
+            try:
+                if r.status_code in _RETRY_STATUS and attempt < MAX_RETRIES:
+                    r.read()
+                    wait = _retry_after(r)
+                else:
+                    r.raise_for_status()
+                    for item in iter_json_array(r.iter_text(), key):
+                        stats.rows_fetched += 1
+                        yield item
+                    return
+            finally:
+                stats.bytes += r.num_bytes_downloaded
+        stats.retries += 1
+        time.sleep(wait)
+
+# --------------------------------------------------------------------------- #
+# Posting record + provider base / registry
+# --------------------------------------------------------------------------- #
+class Posting(NamedTuple):
+    """One matching posting. Tuple-backed (no per-row __dict__), id always str."""
+    id: str
+    title: str
+    url: str
+    company: str = ""
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any], company: str = "") -> "Posting":
+        """Rebuild from a jobs.json row (older files carry int ids)."""
+        return cls(str(d["id"]), d["title"], d["url"], sys.intern(company))
+
+    def as_dict(self) -> Dict[str, str]:
+        return {"id": self.id, "title": self.title, "url": self.url}
+
+PROVIDERS: Dict[str, type] = {}          # watchers.json "ats" → provider class
+
+class WatcherConfigError(ValueError):
+    """A watchers.json entry that can't be turned into a provider."""
+
+class Provider(abc.ABC):
+    """
+    Base for every ATS provider. Subclasses set `ats` (registry key) and
+    `fields` (watchers.json keys passed positionally to __init__), and
+    implement fetch() yielding Posting rows.
+
+    `extra_filter(posting)` is called with each Posting that already passed
+    the intern match – the same normalised row for every ATS – and drops it
+    when it returns False.
+    """
+    ats: str = ""
+    fields: tuple = ("slug",)
+    array_key: str | None = "jobs"          # where the job array sits in self.url's body
+
+    def __init_subclass__(cls, **kw):
+        super().__init_subclass__(**kw)
+        if cls.ats:
+            PROVIDERS[cls.ats] = cls
+
+    def __init__(self, extra_filter=lambda j: True, company: str = ""):
+        self.extra   = extra_filter
+        self.company = sys.intern(company)
+        self.stats   = RunStats(self.company, self.ats)   # sentinel swaps per run
+
+    @classmethod
+    def from_info(cls, name: str, info: Dict[str, Any], **kw) -> "Provider":
+        missing = [k for k in cls.fields if k not in info]
+        if missing:
+            raise WatcherConfigError(f"{cls.ats} entry is missing {', '.join(missing)}")
+        return cls(*(info[k] for k in cls.fields), company=name, **kw)
+
+    @abc.abstractmethod
+    def fetch(self) -> Iterator[Posting]:
+        ...
+
+    def probe(self) -> str:
+        """
+        Cheap "does this board answer?" check for the bulk importer: decode
+        at most one row of the feed. Raises if it doesn't; returns the tier used.
+        """
+        next(stream_json(self.url, self.array_key, stats=self.stats), None)
+        return "get"
+
+    def fingerprint(self, job: Posting) -> str: return job.id
+
+    def _posting(self, id, title, url) -> Posting:
+        return Posting(str(id), title, url, self.company)
+
+    def _keep(self, posts: Iterable[Posting]) -> Iterator[Posting]:
+        return (p for p in posts if self.extra(p))
+
+def build_provider(name: str, info: Dict[str, Any], **kw) -> Provider:
+    """Instantiate the provider for one watchers.json entry."""
+    cls = PROVIDERS.get(info.get("ats"))
+    if cls is None:
+        raise WatcherConfigError(f"unknown ATS {info.get('ats')!r}")
+    return cls.from_info(name, info, **kw)
 
 # --------------------------------------------------------------------------- #
 # Greenhouse
 # --------------------------------------------------------------------------- #
-class GreenhouseProvider:
-    def __init__(self, slug, extra_filter=lambda j: True):
-        self.url   = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs?content=false"
-        self.extra = extra_filter
+class GreenhouseProvider(Provider):
+    ats = "Greenhouse"
 
-    def fetch(self):
-        res = httpx.get(self.url, timeout=15)
-        res.raise_for_status()
-        for j in res.json()["jobs"]:
-            if (j.get("employment_type", "").lower() == "intern" or _INTERN_RE.search(j["title"])) \
-                    and self.extra(j):
-                yield {"id": j["id"], "title": j["title"], "url": j["absolute_url"]}
+    def __init__(self, slug, extra_filter=lambda j: True, company=""):
+        super().__init__(extra_filter, company)
+        self.url   = ats_url("boards-api.greenhouse.io", f"/v1/boards/{slug}/jobs?content=false")
 
-    def fingerprint(self, job): return str(job["id"])
+    def fetch(self):
+        return self._keep(
+            self._posting(j["id"], j["title"], j["absolute_url"])
+            for j in stream_json(self.url, self.array_key, stats=self.stats)
+            if j.get("employment_type", "").lower() == "intern" or _INTERN_RE.search(j["title"]))
 
 # --------------------------------------------------------------------------- #
 # Lever
 # --------------------------------------------------------------------------- #
-class LeverProvider:
+class LeverProvider(Provider):
     """Public endpoint:  https://api.lever.co/v0/postings/<account>?mode=json"""
-    def __init__(self, org, extra_filter=lambda j: True):
-        self.url   = f"https://api.lever.co/v0/postings/{org}?mode=json"
-        self.extra = extra_filter
+    ats = "Lever"
+    array_key = None                         # body is a bare array
 
-    def fetch(self):
-        r = httpx.get(self.url, timeout=15); r.raise_for_status()
-        for j in r.json():
-            if _INTERN_RE.search(j["text"]) and self.extra(j):
-                yield {"id": j["id"], "title": j["text"], "url": j["hostedUrl"]}
+    def __init__(self, org, extra_filter=lambda j: True, company=""):
+        super().__init__(extra_filter, company)
+        self.url   = ats_url("api.lever.co", f"/v0/postings/{org}?mode=json")
 
-    def fingerprint(self, job): return str(job["id"])
+    def fetch(self):
+        return self._keep(
+            self._posting(j["id"], j["text"], j["hostedUrl"])
+            for j in stream_json(self.url, self.array_key, stats=self.stats)
+            if _INTERN_RE.search(j["text"]))
 
 # --------------------------------------------------------------------------- #
 # Ashby
 # --------------------------------------------------------------------------- #
-class AshbyProvider:
+class AshbyProvider(Provider):
     """Public endpoint:  https://api.ashbyhq.com/posting-api/job-board/<slug>"""
-    def __init__(self, slug, extra_filter=lambda j: True):
-        self.url   = f"https://api.ashbyhq.com/posting-api/job-board/{slug}"
-        self.extra = extra_filter
+    ats = "Ashby"
 
-    def fetch(self):
-        r = httpx.get(self.url, timeout=15); r.raise_for_status()
-        for j in r.json()["jobs"]:
-            if _INTERN_RE.search(j["title"]) and self.extra(j):
-                yield {"id": j["id"], "title": j["title"], "url": j["applyUrl"]}
+    def __init__(self, slug, extra_filter=lambda j: True, company=""):
+        super().__init__(extra_filter, company)
+        self.url   = ats_url("api.ashbyhq.com", f"/posting-api/job-board/{slug}")
 
-    def fingerprint(self, job): return str(job["id"])
+    def fetch(self):
+        return self._keep(
+            self._posting(j["id"], j["title"], j["applyUrl"])
+            for j in stream_json(self.url, self.array_key, stats=self.stats)
+            if _INTERN_RE.search(j["title"]))
 
 # --------------------------------------------------------------------------- #
 # Universal Workday provider (GET → POST → intercept)
 # --------------------------------------------------------------------------- #
-class WorkdayProvider:
+class WorkdayProvider(Provider):
     """
     Works for every Workday tenant.
     • Tier-1: GET  /getJobs
     • Tier-2: POST /jobs   (optional applied_facets)
     • Tier-3: head-less intercept (XHR / fetch with jobPostings)
     """
+    ats    = "Workday"
+    fields = ("tenant", "cluster", "site", "locale")
 
     def __init__(self,
                  tenant: str,
@@ -77,63 +323,99 @@ class WorkdayProvider:
                  site: str = "External",
                  locale: str = "en-US",
                  applied_facets: Dict[str, List[str]] | None = None,
-                 extra_filter=lambda j: True):
+                 extra_filter=lambda j: True,
+                 company: str = ""):
+        super().__init__(extra_filter, company)
         self.tenant, self.cluster, self.site, self.locale = tenant, cluster, site, locale
         self.facets  = applied_facets or {}
-        self.extra   = extra_filter
+        self._host   = f"{tenant}.{cluster}.myworkdayjobs.com"
 
     # ---------- public entry ----------
-    def fetch(self) -> Iterator[Dict[str, Any]]:
-        for strat in (self._get_loop, self._post_loop, self._intercept_loop):
+    def fetch(self) -> Iterator[Posting]:
+        for tier, strat in (("get", self._get_loop), ("post", self._post_loop),
+                            ("intercept", self._intercept_loop)):
             found = False
+            self.stats.tiers.append(tier)
             try:
                 for job in strat():
                     found = True
-                    if self.extra(job):
+                    if self.extra(job):       # Posting, same as every provider
                         yield job
                 if found:
+                    self.stats.tier = tier
                     return            # stop once we produced rows
             except Exception as e:
+                self.stats.errors.append(f"{tier}: {e}")
                 print(f"[{self.tenant}] {strat.__name__} failed:", e)
 
-    def fingerprint(self, job): return job["id"]
-
     # ---------- Tier-1: GET ----------
     def _get_loop(self):
         offset = 0
-        base = (f"https://{self.tenant}.{self.cluster}.myworkdayjobs.com/"
-                f"wday/cxs/{self.tenant}/{self.site}/getJobs")
+        base = ats_url(self._host, f"/wday/cxs/{self.tenant}/{self.site}/getJobs")
         while True:
             url = f"{base}?$top=50&$skip={offset}&$searchText=Intern"
-            data = httpx.get(url, timeout=30).json()
+            data = http("GET", url, self.stats, timeout=30).json()
             posts = data.get("jobPostings", [])
             if not posts:
                 break
             yield from self._filter(posts)
-            offset += 50
+            offset += len(posts)      # server may cap the page below 50
 
     # ---------- Tier-2: POST ----------
     def _post_loop(self):
         offset = 0
-        url = (f"https://{self.tenant}.{self.cluster}.myworkdayjobs.com/"
-               f"wday/cxs/{self.tenant}/{self.site}/jobs")
+        url = ats_url(self._host, f"/wday/cxs/{self.tenant}/{self.site}/jobs")
         while True:
             payload = {"appliedFacets": self.facets,
                        "limit": 50, "offset": offset, "searchText": ""}
-            r = httpx.post(url, json=payload, timeout=30)
+            r = http("POST", url, self.stats, json=payload, timeout=30)
             if r.status_code >= 400:
+                import httpx
                 raise httpx.HTTPStatusError("POST failed", request=r.request, response=r)
             posts = r.json().get("jobPostings", [])
             if not posts:
                 break
             yield from self._filter(posts)
-            offset += 50
+            offset += len(posts)      # server may cap the page below 50
+
+    # ---------- probe (bulk importer) ----------
+    def probe(self, intercept: bool = False, slots=None) -> str:
+        """
+        First tier that returns a jobPostings feed: "get", "post" or "intercept".
+        `slots` (a semaphore) bounds concurrent browsers; it is only taken for
+        the intercept step, never for the GET / POST requests.
+        """
+        cxs = ats_url(self._host, f"/wday/cxs/{self.tenant}/{self.site}")
+        tries = (("get",  lambda: http("GET", f"{cxs}/getJobs?$top=1&$skip=0", self.stats,
+                                       timeout=30)),
+                 ("post", lambda: http("POST", f"{cxs}/jobs", self.stats, timeout=30,
+                                       json={"appliedFacets": self.facets, "limit": 1,
+                                             "offset": 0, "searchText": ""})))
+        for tier, call in tries:
+            self.stats.tiers.append(tier)
+            try:
+                r = call()
+                if r.status_code == 200 and "jobPostings" in r.json():
+                    return tier
+            except Exception as e:
+                self.stats.errors.append(f"{tier}: {e}")
+        if intercept:
+            self.stats.tiers.append("intercept")
+            with slots or contextlib.nullcontext():
+                feed = self._intercept_feed()
+            if feed is not None:
+                return "intercept"
+        raise LookupError(f"no Workday feed for {self.tenant}/{self.site} "
+                          f"(tried {', '.join(self.stats.tiers)})")
 
     # ---------- Tier-3: Playwright intercept ----------
     def _intercept_loop(self):
+        yield from self._filter(self._intercept_feed() or [])
+
+    def _intercept_feed(self) -> List[Dict[str, Any]] | None:
+        """Raw jobPostings captured from the SPA's own XHR, or None."""
         locale_part = f"{self.locale}/" if self.locale else ""
-        ui = (f"https://{self.tenant}.{self.cluster}.myworkdayjobs.com/"
-              f"{locale_part}{self.site}?q=Internship").replace("//", "/")
+        ui = ats_url(self._host, f"/{locale_part}{self.site}?q=Internship")
 
         def looks_like_feed(resp):
             if resp.request.resource_type not in ("xhr", "fetch") or resp.status != 200:
@@ -141,6 +423,7 @@ class WorkdayProvider:
             url = resp.url
             return url.endswith("/jobs") or "/getJobs" in url
 
+        from playwright.sync_api import sync_playwright
         with sync_playwright() as p:
             page = p.chromium.launch(headless=True).new_page()
             page.goto(ui, timeout=90_000)
@@ -149,33 +432,33 @@ class WorkdayProvider:
                                            timeout=150_000)
                 data = resp.json()
             except Exception:
-                return
-            yield from self._filter(data.get("jobPostings", []))
+                return None
+            self.stats.requests += 1
+            self.stats.bytes    += resp.request.sizes()["responseBodySize"]
+            return data.get("jobPostings", [])
 
     # ---------- common filter ----------
     def _filter(self, posts: List[Dict[str, Any]]):
         for j in posts:
+            self.stats.rows_fetched += 1
             title = j.get("title") or j.get("titleText", "")
             if not _INTERN_RE.search(title):
                 continue
-            yield {
-                "id": str(j.get("jobPostingId") or j.get("id") or j.get("externalPath")),
-                "title": title,
-                "url": (f"https://{self.tenant}.{self.cluster}.myworkdayjobs.com/"
-                        f"{self.locale}/{self.site}/job/{j['externalPath']}").replace("//", "/")
-            }
+            yield self._posting(
+                j.get("jobPostingId") or j.get("id") or j.get("externalPath"),
+                title,
+                (f"https://{self.tenant}.{self.cluster}.myworkdayjobs.com/"
+                 f"{self.locale}/{self.site}/job/{j['externalPath']}").replace("//", "/"))
 
 # --------------------------------------------------------------------------- #
-# Thin wrapper for intercept-only boards (keeps sentinel logic unchanged)
+# Intercept-only boards: same tenant fields, skips the GET/POST tiers
 # --------------------------------------------------------------------------- #
-class WorkdayInterceptProvider:
-    """Simply delegates to WorkdayProvider but skips GET/POST noise."""
-    def __init__(self, **info):
-        self.provider = WorkdayProvider(**info)
+class WorkdayInterceptProvider(WorkdayProvider):
+    """Goes straight to the head-less intercept tier (skips GET/POST noise)."""
+    ats = "WorkdayIntercept"
 
     def fetch(self):
-        # go straight to the provider's intercept tier by calling _intercept_loop
-        yield from self.provider._intercept_loop()
-
-    def fingerprint(self, job):
-        return self.provider.fingerprint(job)
+        self.stats.tiers.append("intercept")
+        for job in self._keep(self._intercept_loop()):
+            self.stats.tier = "intercept"
+            yield job
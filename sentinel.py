@@ -1,12 +1,9 @@
-import json, pathlib, time, traceback
-from providers import (
-    GreenhouseProvider, LeverProvider, AshbyProvider,
-    WorkdayProvider, WorkdayInterceptProvider,
-)
+import argparse, json, pathlib, re, time, traceback
+from providers import build_provider, RunStats, WatcherConfigError
 from notifier import push
 from sys import exit
 import os, pathlib, sys
-os.chdir(pathlib.Path(__file__).parent)  
+os.chdir(os.getenv("PREFIRE_HOME") or pathlib.Path(__file__).parent)   # state dir
 
 
 # ──────────────── WATCH LIST ────────────────
@@ -17,32 +14,29 @@ if not CFG.exists():
 raw = json.loads(CFG.read_text())
 WATCHERS = {}
 for name, info in raw.items():
-    ats = info["ats"]
-    if ats == "Greenhouse":
-        WATCHERS[name] = GreenhouseProvider(info["slug"])
-    elif ats == "Lever":
-        WATCHERS[name] = LeverProvider(info["slug"])
-    elif ats == "Ashby":
-        WATCHERS[name] = AshbyProvider(info["slug"])
-    elif ats == "Workday":
-        WATCHERS[name] = WorkdayProvider(
-            tenant=info["tenant"], cluster=info["cluster"],
-            site=info["site"],   locale=info["locale"]
-        )
-    elif ats == "WorkdayIntercept":
-        WATCHERS[name] = WorkdayInterceptProvider(
-            tenant=info["tenant"], cluster=info["cluster"],
-            site=info["site"],   locale=info["locale"]
-        )
-    else:
-        print((f"[WARN] Unknown ATS {ats} for {name}").encode('ascii', errors='replace').decode())
+    try:
+        WATCHERS[name] = build_provider(name, info)
+    except WatcherConfigError as e:
+        print((f"[WARN] Skipping {name}: {e}").encode('ascii', errors='replace').decode())
 
 # ──────────── NOTIFIED TRACKING ─────────────
 NOTIFIED_F = pathlib.Path("notified.json")
 JOBS_F = pathlib.Path("jobs.json")
+METRICS_F   = pathlib.Path("metrics.jsonl")     # one line per watcher per run
+METRICS_MAX = 5_000_000                         # bytes before rolling to .1
+SHARD_F     = pathlib.Path("shard.json")        # sharded-mode defaults (see shards.py)
+
+class NotifiedSet(set):
+    """notified.json as a set; claim() marks a fingerprint, False if already seen."""
+    def claim(self, fid):
+        if fid in self:
+            return False
+        self.add(fid)
+        return True
+    release = set.discard
 
 def load_notified():
-    return set(json.loads(NOTIFIED_F.read_text()) if NOTIFIED_F.exists() else [])
+    return NotifiedSet(json.loads(NOTIFIED_F.read_text()) if NOTIFIED_F.exists() else [])
 def save_notified(notified):
     NOTIFIED_F.write_text(json.dumps(list(notified)))
 
@@ -50,24 +44,173 @@ def safe_print(*args, **kwargs):
     msg = " ".join(str(x) for x in args)
     print(msg.encode('ascii', errors='replace').decode(), **kwargs)
 
-if __name__ == "__main__":
-    notified = load_notified()
-    all_jobs = {}
-    for name, watcher in WATCHERS.items():
+# ──────────────── METRICS ────────────────
+def open_metrics(path=METRICS_F):
+    if path.exists() and path.stat().st_size > METRICS_MAX:
+        os.replace(path, path.with_suffix(".jsonl.1"))
+    return path.open("a", encoding="utf-8")
+
+def _prom_label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+PROM_GAUGES = (
+    ("wall_seconds", "wall_s",       "Wall time of the last fetch"),
+    ("requests",     "requests",     "HTTP requests issued"),
+    ("bytes",        "bytes",        "Response bytes downloaded"),
+    ("retries",      "retries",      "429/503 retries"),
+    ("rows_fetched", "rows_fetched", "Rows decoded from the board"),
+    ("rows_matched", "rows_matched", "Rows that passed the filters"),
+    ("notified",     "notified",     "Notifications sent"),
+    ("errors",       "errors",       "Errors recorded"),
+)
+
+def write_prom(path, all_stats, started):
+    """Prometheus textfile-collector dump of the run (atomic replace)."""
+    lines = ["# HELP prefire_run_timestamp_seconds Start of the last sentinel run",
+             "# TYPE prefire_run_timestamp_seconds gauge",
+             f"prefire_run_timestamp_seconds {started:.0f}"]
+    for metric, attr, help_ in PROM_GAUGES:
+        lines += [f"# HELP prefire_watcher_{metric} {help_}",
+                  f"# TYPE prefire_watcher_{metric} gauge"]
+        for st in all_stats:
+            val = getattr(st, attr)
+            val = len(val) if isinstance(val, list) else val
+            lines.append(f'prefire_watcher_{metric}{{watcher="{_prom_label(st.watcher)}",'
+                         f'ats="{_prom_label(st.ats)}",tier="{_prom_label(st.tier)}"}} {val}')
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+def run(watchers, notified, out, on_stats=None, profile=None):
+    """
+    Stream every (name, watcher) pair straight through diff / notify and into
+    `out` (jobs.json layout) – nothing is kept beyond the posting in flight.
+    `notified` is a NotifiedSet or, when sharded, the store's SharedNotified.
+    `on_stats(RunStats)` is called after each watcher; the watcher named
+    `profile` runs under cProfile (dumped to profile-<name>.prof).
+    """
+    out.write("{")
+    first_board = True
+    for name, watcher in watchers:
+        out.write(("" if first_board else ",") + f"\n  {json.dumps(name)}: [")
+        first_board, first_job = False, True
+        stats = watcher.stats = RunStats(name, watcher.ats)
+        prof = None
+        if name == profile:
+            import cProfile
+            prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        if prof: prof.enable()
         try:
-            jobs = list(watcher.fetch())
-            all_jobs[name] = jobs
-            for job in jobs:
+            for job in watcher.fetch():
+                stats.rows_matched += 1
+                out.write(("" if first_job else ",") + "\n    " + json.dumps(job.as_dict()))
+                first_job = False
                 fid = watcher.fingerprint(job)
-                if fid in notified:
+                if not notified.claim(fid):
+                    continue                # seen before (or another worker got it)
+                try:
+                    push(f"[{name}] {job.title} → {job.url}")
+                except Exception as e:      # keep writing the board; retry the alert next run
+                    notified.release(fid)
+                    stats.errors.append(f"push: {type(e).__name__}: {e}")
+                    safe_print(f"[WARN] {name} push failed:", e)
                     continue
-                push(f"[{name}] {job['title']} → {job['url']}")
-                safe_print("ALERT:", name, "→", job["title"])
-                notified.add(fid)
+                safe_print("ALERT:", name, "→", job.title)
+                stats.notified += 1
         except Exception as e:
+            stats.errors.append(f"{type(e).__name__}: {e}")
             safe_print(f"[WARN] {name} watcher failed:", e)
             tb_str = traceback.format_exc()
             safe_print(tb_str)
-    save_notified(notified)
-    JOBS_F.write_text(json.dumps(all_jobs, indent=2))
-    exit(0)
+        if prof:
+            prof.disable()
+            safe = re.sub(r"[^\w.-]", "_", name)     # no / : * ? etc. in the file name
+            dump = pathlib.Path(f"profile-{safe}.prof")
+            prof.dump_stats(dump)
+            safe_print(f"[PROFILE] {name} → {dump}")
+            import pstats
+            pstats.Stats(prof, stream=sys.stdout).sort_stats("cumulative").print_stats(25)
+        stats.wall_s = round(time.perf_counter() - t0, 4)
+        out.write("]" if first_job else "\n  ]")
+        if on_stats:
+            on_stats(stats)
+    out.write("\n}\n")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check every watcher once and notify new postings")
+    ap.add_argument("--metrics", default=str(METRICS_F),
+                    help="JSONL file to append per-watcher run metrics to ('' disables)")
+    ap.add_argument("--prom", metavar="FILE",
+                    help="also write a Prometheus textfile-collector .prom file")
+    ap.add_argument("--profile", metavar="WATCHER",
+                    help="run this watcher under cProfile (writes profile-<name>.prof)")
+    ap.add_argument("--shard-db", metavar="FILE",
+                    help="sharded mode: lease store shared by every worker on this host "
+                         "(SQLite on a local disk; default: \"db\" from shard.json)")
+    ap.add_argument("--worker-id", help="this worker's name in sharded mode "
+                                        "(default: shard.json \"worker_id\", else \"main\")")
+    ap.add_argument("--lease-ttl", type=float, default=None,
+                    help="lease length in seconds, ≥ the schedule interval (default 3600)")
+    args = ap.parse_args(argv)
+
+    started, run_id = time.time(), time.strftime("%Y%m%dT%H%M%S")
+    metrics = open_metrics(pathlib.Path(args.metrics)) if args.metrics else None
+    collected = []
+
+    store, worker, jobs_f = None, None, JOBS_F
+    if not args.shard_db and SHARD_F.exists():          # GUI run / scheduled task
+        import shards
+        cfg = shards.load_config(SHARD_F)
+        args.shard_db  = cfg.get("db")
+        args.worker_id = args.worker_id or cfg.get("worker_id")
+        args.lease_ttl = args.lease_ttl or cfg.get("lease_ttl")
+    if args.shard_db:
+        import shards
+        store = shards.LeaseStore(args.shard_db, args.worker_id, args.lease_ttl or shards.LEASE_TTL)
+        worker = store.worker
+        if not store.lock_run():
+            safe_print(f"[SKIP] worker {worker} is already running")
+            store.close()
+            if metrics:
+                metrics.close()
+            return 0
+        notified = store.notified()
+        if not len(notified):                   # first sharded run: keep old history
+            notified.seed(load_notified())
+        watchers = store.claimed(WATCHERS.items())
+        jobs_f = pathlib.Path(f"jobs-{worker}.json")    # merged by the GUI
+    else:
+        notified = load_notified()
+        watchers = WATCHERS.items()
+
+    def on_stats(st):
+        if metrics:
+            rec = {"run": run_id, "ts": round(started), **st.as_dict()}
+            if worker:
+                rec["worker"] = worker
+            metrics.write(json.dumps(rec) + "\n")
+            metrics.flush()
+        if args.prom:
+            collected.append(st)
+
+    tmp = jobs_f.with_name(f"{jobs_f.name}.{os.getpid()}.tmp")   # runs may overlap
+    try:
+        with tmp.open("w") as out:
+            run(watchers, notified, out, on_stats, args.profile)
+        os.replace(tmp, jobs_f)       # GUI never sees a half-written file
+    finally:
+        if not store:
+            save_notified(notified)   # alerts already sent, even if the write failed
+        tmp.unlink(missing_ok=True)
+        if metrics:
+            metrics.close()
+        if store:
+            store.close()
+    if args.prom:
+        write_prom(args.prom, collected, started)
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,187 @@
+# shards.py  –  split one watchers.json across several sentinel.py workers.
+#
+# Single host only: every worker runs on the same machine with the same
+# PREFIRE_HOME, and the SQLite file lives on a local disk. WAL mode needs
+# shared memory between the processes, so SMB / NFS shares are not supported
+# (locking fails or the file gets corrupted). The store has three tables:
+#   workers   – heartbeat per worker; "live" = seen within one lease TTL
+#   leases    – watcher → (worker, expires); a watcher is fetched only by the
+#               worker holding an unexpired lease, so nobody double-fetches
+#   notified  – global alert dedup (INSERT OR IGNORE decides who alerts)
+#
+# Assignment is a consistent-hash ring over the live workers, so adding or
+# losing a worker only moves ~1/N of the watchers. A dead worker drops out of
+# the ring once its heartbeat is older than the TTL – the same moment its last
+# leases expire – and the new ring owners pick them up on their next run.
+#
+# Only one process runs as a given worker id at a time: lock_run() takes an
+# OS lock on <db>.<worker>.lock (dropped by the OS if the process dies), and a
+# second run as the same worker – GUI "Run check" during the scheduled task –
+# skips instead of renewing the same leases and fetching every board again.
+#
+# shard.json next to watchers.json turns sharding on for runs that don't pass
+# --shard-db (GUI "Run check", the scheduled task):
+#   {"db": "leases.db", "lease_ttl": 3600}
+
+import bisect, hashlib, json, os, pathlib, re, sqlite3, time
+from typing import Iterable, Iterator, Tuple, Any
+
+LEASE_TTL = 3600          # seconds; keep ≥ the scheduler interval
+VNODES    = 64            # ring points per worker
+CONFIG_F  = pathlib.Path("shard.json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers  (worker TEXT PRIMARY KEY, seen REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS leases   (watcher TEXT PRIMARY KEY, worker TEXT NOT NULL,
+                                     expires REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS notified (fid TEXT PRIMARY KEY, worker TEXT, ts REAL);
+"""
+
+def load_config(path=CONFIG_F) -> dict:
+    """shard.json as a dict; {} when the file is missing (= plain run)."""
+    path = pathlib.Path(path)
+    txt = path.read_text().strip() if path.exists() else ""
+    return json.loads(txt) if txt else {}
+
+DEFAULT_WORKER = "main"   # GUI runs and the scheduled task; extra workers pass --worker-id
+
+def _hash(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    def __init__(self, workers: Iterable[str], vnodes: int = VNODES):
+        self._ring = sorted((_hash(f"{w}#{i}"), w) for w in set(workers) for i in range(vnodes))
+        self._keys = [k for k, _ in self._ring]
+
+    def owner(self, key: str) -> str | None:
+        if not self._ring:
+            return None
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._ring)
+        return self._ring[i][1]
+
+class LeaseStore:
+    def __init__(self, path, worker: str | None = None, ttl: float = LEASE_TTL):
+        if str(path).startswith(("//", "\\\\")):
+            raise ValueError(f"lease store {path} is on a network share; "
+                             "SQLite WAL needs a local disk")
+        self.worker = worker or DEFAULT_WORKER
+        self.ttl    = ttl
+        self.path   = pathlib.Path(path)
+        self._lock  = None
+        self.db = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")      # one fsync per checkpoint, not per claim
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+        if self._lock:
+            self._lock.close()                            # releases the run lock
+
+    def lock_run(self) -> bool:
+        """Exclusive run lock for this worker id; False if another process holds it."""
+        safe = re.sub(r"[^\w.-]", "_", self.worker)
+        f = open(self.path.with_name(f"{self.path.name}.{safe}.lock"), "a+")
+        try:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        self._lock = f
+        return True
+
+    # ---------- membership ----------
+    def heartbeat(self):
+        self.db.execute("INSERT OR REPLACE INTO workers VALUES (?, ?)", (self.worker, time.time()))
+
+    def live_workers(self) -> list[str]:
+        cutoff = time.time() - self.ttl           # gone once its last leases have expired
+        return [w for (w,) in self.db.execute("SELECT worker FROM workers WHERE seen > ?", (cutoff,))]
+
+    def ring(self) -> HashRing:
+        return HashRing(self.live_workers() + [self.worker])
+
+    # ---------- leases ----------
+    def claim(self, watcher: str) -> bool:
+        """Take (or renew) the lease on `watcher` unless another worker holds a live one."""
+        now = time.time()
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            cur = self.db.execute(
+                "UPDATE leases SET worker = ?, expires = ? "
+                "WHERE watcher = ? AND (worker = ? OR expires < ?)",
+                (self.worker, now + self.ttl, watcher, self.worker, now))
+            if cur.rowcount == 0:
+                cur = self.db.execute("INSERT OR IGNORE INTO leases VALUES (?, ?, ?)",
+                                      (watcher, self.worker, now + self.ttl))
+            self.db.execute("UPDATE workers SET seen = ? WHERE worker = ?", (now, self.worker))
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+        return cur.rowcount == 1
+
+    def release_unowned(self, ring: HashRing):
+        """
+        Hand back leases the ring now gives to someone else. They were fetched
+        on our previous run, so the new owner taking them this run is not a
+        double fetch – it just avoids waiting out the TTL.
+        """
+        held = [w for (w,) in self.db.execute("SELECT watcher FROM leases WHERE worker = ?",
+                                              (self.worker,))]
+        gone = [(w, self.worker) for w in held if ring.owner(w) != self.worker]
+        if gone:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.executemany("DELETE FROM leases WHERE watcher = ? AND worker = ?", gone)
+            self.db.execute("COMMIT")
+
+    def claimed(self, watchers: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield the (name, watcher) pairs this worker owns on the ring, leasing
+        each one just before it is handed out.
+        """
+        self.heartbeat()
+        ring = self.ring()
+        self.release_unowned(ring)
+        for name, watcher in watchers:
+            if ring.owner(name) == self.worker and self.claim(name):
+                yield name, watcher
+
+    # ---------- global notification dedup ----------
+    def notified(self) -> "SharedNotified":
+        return SharedNotified(self)
+
+class SharedNotified:
+    """Same claim/release protocol as sentinel's NotifiedSet, backed by the store."""
+    def __init__(self, store: LeaseStore):
+        self.store = store
+
+    def __len__(self):
+        return self.store.db.execute("SELECT COUNT(*) FROM notified").fetchone()[0]
+
+    def claim(self, fid: str) -> bool:
+        cur = self.store.db.execute("INSERT OR IGNORE INTO notified VALUES (?, ?, ?)",
+                                    (fid, self.store.worker, time.time()))
+        return cur.rowcount == 1
+
+    def release(self, fid: str):
+        self.store.db.execute("DELETE FROM notified WHERE fid = ? AND worker = ?",
+                              (fid, self.store.worker))
+
+    def clear(self):
+        """Forget every alert (the GUI's "Clear notifications")."""
+        self.store.db.execute("DELETE FROM notified")
+
+    def seed(self, fids: Iterable[str]):
+        """One-off import of an existing notified.json so nothing re-alerts."""
+        db = self.store.db
+        db.execute("BEGIN IMMEDIATE")
+        db.executemany("INSERT OR IGNORE INTO notified VALUES (?, NULL, NULL)",
+                       ((f,) for f in fids))
+        db.execute("COMMIT")
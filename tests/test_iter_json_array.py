@@ -0,0 +1,60 @@
+# tests/test_iter_json_array.py  –  providers.iter_json_array vs json.loads
+# under arbitrary network chunking.
+#
+#   python -m pytest -q tests
+
+import json, pathlib, random, sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from providers import iter_json_array
+
+BODIES = [
+    ('{"total":1.5,"jobs":[{"id":1,"title":"Intern"},{"id":2,"title":"x"}],"meta":{"n":2}}', "jobs"),
+    ('{"meta":{"total":-12.5e3,"ok":true,"none":null},"jobs":[1.25, 2e-3, true, false, null, "a,]}"]}', "jobs"),
+    ('[{"id":"a","text":"Summer Intern \\u00e9\\"q\\""}, {"id":"b","text":"x"}]', None),
+    ('  [ 10 , 20 ,\r\n 30 ]  ', None),
+    ('{"jobs":[]}', "jobs"),
+    ('{}', "jobs"),
+    ('{"other":[1,2]}', "jobs"),
+    ('[]', None),
+]
+
+def _chunks(s, rng):
+    out, i = [], 0
+    while i < len(s):
+        n = rng.randint(1, 7)
+        out.append(s[i:i + n])
+        i += n
+    return out
+
+def _expected(body, key):
+    doc = json.loads(body)
+    return doc if key is None else doc.get(key, [])
+
+@pytest.mark.parametrize("body,key", BODIES)
+def test_random_chunk_splits(body, key):
+    rng = random.Random(body)
+    for _ in range(200):
+        assert list(iter_json_array(_chunks(body, rng), key)) == _expected(body, key)
+
+@pytest.mark.parametrize("body,key", BODIES)
+def test_every_two_chunk_split(body, key):
+    for i in range(len(body) + 1):
+        assert list(iter_json_array([body[:i], body[i:]], key)) == _expected(body, key)
+
+@pytest.mark.parametrize("body,key", [
+    ('[{"a":1} {"b":2}]', None),          # missing comma between items
+    ('[1 2]', None),
+    ('[1,]', None),
+    ('[1,2', None),                       # truncated
+    ('{"total":1 "jobs":[1]}', "jobs"),   # missing comma between fields
+    ('{"total":1.,"jobs":[1]}', "jobs"),
+    ('"jobs"', "jobs"),
+])
+def test_malformed_bodies_raise(body, key):
+    rng = random.Random(body)
+    for chunks in ([body], list(body), _chunks(body, rng)):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunks, key))
@@ -0,0 +1,106 @@
+# tests/test_shards.py  –  lease store, hash ring and shared dedup on temp
+# SQLite files.
+#
+#   python -m pytest -q tests
+
+import pathlib, sys
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import shards
+from shards import HashRing, LeaseStore
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "leases.db"
+
+@pytest.fixture
+def stores(db):
+    opened = []
+    def make(worker, ttl=60):
+        st = LeaseStore(db, worker, ttl)
+        opened.append(st)
+        return st
+    yield make
+    for st in opened:
+        st.close()
+
+def test_live_lease_blocks_other_worker(stores):
+    a, b = stores("a"), stores("b")
+    assert a.claim("acme")
+    assert not b.claim("acme")
+    assert a.claim("acme")                      # renewing your own lease is fine
+
+def test_expired_lease_is_taken_over(stores):
+    a, b = stores("a"), stores("b")
+    assert a.claim("acme")
+    a.db.execute("UPDATE leases SET expires = 0 WHERE watcher = 'acme'")
+    assert b.claim("acme")
+    assert not a.claim("acme")
+
+def test_release_unowned_drops_moved_leases(stores):
+    a = stores("a")
+    names = [f"board{i}" for i in range(200)]
+    for n in names:
+        assert a.claim(n)
+    ring = HashRing(["a", "b"])
+    a.release_unowned(ring)
+    held = {w for (w,) in a.db.execute("SELECT watcher FROM leases WHERE worker = 'a'")}
+    assert held == {n for n in names if ring.owner(n) == "a"}
+    assert 0 < len(held) < len(names)
+    b = stores("b")
+    assert all(b.claim(n) for n in names if ring.owner(n) == "b")
+
+def test_ring_moves_about_one_nth_of_keys():
+    keys = [f"board{i}" for i in range(5000)]
+    before = HashRing(["a", "b", "c"])
+    after = HashRing(["a", "b", "c", "d"])
+    moved = [k for k in keys if before.owner(k) != after.owner(k)]
+    assert all(after.owner(k) == "d" for k in moved)   # only to the new worker
+    assert 0.15 < len(moved) / len(keys) < 0.35        # ~1/4
+
+def test_ring_empty_and_order_independent():
+    assert HashRing([]).owner("x") is None
+    assert HashRing(["a", "b"]).owner("x") == HashRing(["b", "a", "a"]).owner("x")
+
+def test_shared_notified_first_writer_wins(stores):
+    na, nb = stores("a").notified(), stores("b").notified()
+    assert na.claim("fid-1")
+    assert not nb.claim("fid-1")
+    nb.release("fid-1")                         # not b's claim: no effect
+    assert not na.claim("fid-1")
+    na.release("fid-1")                         # failed push: free for a retry
+    assert nb.claim("fid-1")
+    assert len(na) == 1
+    na.clear()
+    assert len(nb) == 0
+
+def test_dead_worker_leaves_ring_after_one_ttl(stores):
+    a, b = stores("a", ttl=60), stores("b", ttl=60)
+    a.heartbeat(); b.heartbeat()
+    assert set(a.live_workers()) == {"a", "b"}
+    b.db.execute("UPDATE workers SET seen = seen - 61 WHERE worker = 'b'")
+    assert a.live_workers() == ["a"]
+
+def test_claimed_splits_boards_without_overlap(stores):
+    a, b = stores("a"), stores("b")
+    a.heartbeat(); b.heartbeat()
+    pairs = [(f"board{i}", None) for i in range(100)]
+    got_a = {n for n, _ in a.claimed(pairs)}
+    got_b = {n for n, _ in b.claimed(pairs)}
+    assert got_a and got_b and not got_a & got_b
+    assert got_a | got_b == {n for n, _ in pairs}
+
+def test_run_lock_is_exclusive_per_worker(stores):
+    a1, a2, b = stores("a"), stores("a"), stores("b")
+    assert a1.lock_run()
+    assert not a2.lock_run()
+    assert b.lock_run()
+    a1.close()
+    assert a2.lock_run()
+
+def test_network_share_refused(tmp_path):
+    with pytest.raises(ValueError):
+        LeaseStore("//nas/prefire/leases.db")
+    assert shards.load_config(tmp_path / "missing.json") == {}
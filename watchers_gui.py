@@ -4,7 +4,7 @@
 
 import json, pathlib, subprocess, sys, threading, time, re, platform, datetime
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import webbrowser, getpass, ctypes, os
 
 # ╔════════════════════════════════════════════════════════════════════╗
@@ -46,14 +46,14 @@ SEEN_F       = pathlib.Path("seen.json")
 NOTIFIED_F   = pathlib.Path("notified.json")
 LAST_CHECK_F = pathlib.Path("last_check.txt")
 JOBS_F       = pathlib.Path("jobs.json")           # written by sentinel.py
-ATS_OPTIONS  = ("Greenhouse", "Lever", "Ashby", "Workday", "WorkdayIntercept")
+METRICS_F    = pathlib.Path("metrics.jsonl")       # written by sentinel.py
+SHARD_F      = pathlib.Path("shard.json")          # sharded mode, read by sentinel.py
 SCHED_TASK_NAME = "SentinelJobChecker"             # Windows TaskScheduler task
 
-# providers (unchanged) ---------------------------------------------------------
-from providers import (
-    GreenhouseProvider, LeverProvider, AshbyProvider,
-    WorkdayProvider, WorkdayInterceptProvider
-)
+# providers ---------------------------------------------------------------------
+from providers import PROVIDERS, Posting, build_provider
+from bulk_import import classify_url, bulk_import, read_urls, format_report
+ATS_OPTIONS  = tuple(PROVIDERS)                    # registry order
 # from notifier import push  # only in sentinel.py
 
 # helper load/save --------------------------------------------------------------
@@ -68,6 +68,14 @@ def load_cfg():
     return {}
 def save_cfg(d): CFG.write_text(json.dumps(d, indent=2))
 def load_seen():  return set(json.loads(SEEN_F.read_text()) if SEEN_F.exists() else [])
+def load_jobs():
+    """jobs.json plus sharded workers' jobs-<worker>.json; newest file wins per board."""
+    files=[f for f in (JOBS_F,*pathlib.Path().glob("jobs-*.json")) if f.exists()]
+    merged={}
+    for f in sorted(files,key=lambda f:f.stat().st_mtime):
+        try: merged.update(json.loads(f.read_text()))
+        except json.JSONDecodeError: continue
+    return merged
 def save_seen(s): SEEN_F.write_text(json.dumps(list(s)))
 
 # ────────────────── .env helpers ──────────────────
@@ -164,6 +172,7 @@ clr_btn   = _btn("Clear seen list")
 del_btn   = _btn("Delete selected")
 test_btn  = _btn("Test Fetch")
 clear_notified_btn = _btn("Clear notifications")
+slow_btn  = _btn("Slowest boards")
 
 tree = ttk.Treeview(left, columns=("dot","title","roles"), show="tree headings",
                     height=14, selectmode="browse")
@@ -201,11 +210,7 @@ ttk.Label(form,text="ATS:",anchor="w",font=font_bold).grid(row=1,column=0,sticky
 ats_cb=ttk.Combobox(form,textvariable=ats_var,values=ATS_OPTIONS,state="readonly",width=27)
 ats_cb.grid(row=1,column=1,sticky="ew",pady=4)
 fields_entries={k:row(k.capitalize(),v,i+2) for i,(k,v) in enumerate(fields.items())}
-ATS_USAGE = {
-    "slug":{"Greenhouse","Lever","Ashby"}, "tenant":{"Workday","WorkdayIntercept"},
-    "cluster":{"Workday","WorkdayIntercept"},"site":{"Workday","WorkdayIntercept"},
-    "locale":{"Workday","WorkdayIntercept"}
-}
+ATS_USAGE = {k:{a for a,cls in PROVIDERS.items() if k in cls.fields} for k in fields}
 def _update_vis(*_):
     sel=ats_var.get()
     for k,e in fields_entries.items():
@@ -216,15 +221,10 @@ def add_company():
     name=name_var.get().strip()
     if not name: messagebox.showerror("Input","Company name required"); return
     info={"ats":ats_var.get()}
-    if info["ats"] in ("Greenhouse","Lever","Ashby"):
-        slug=fields["slug"].get().strip()
-        if not slug: messagebox.showerror("Input","slug/org required"); return
-        info["slug"]=slug
-    else:
-        for k in ("tenant","cluster","site","locale"):
-            v=fields[k].get().strip()
-            if not v and k!="locale": messagebox.showerror("Input",f"{k} required"); return
-            info[k]=v
+    for k in PROVIDERS[info["ats"]].fields:
+        v=fields[k].get().strip()
+        if not v and k!="locale": messagebox.showerror("Input",f"{k} required"); return
+        info[k]=v
     cfg=load_cfg(); cfg[name]=info; save_cfg(cfg); refresh_tree()
     status.config(text=f"✔ {name} saved"); root.after(2500,lambda:status.config(text="Ready"))
 ttk.Button(form,text="Add / Update",command=add_company,style="TButton")\
@@ -236,25 +236,35 @@ url_var=tk.StringVar()
 ttk.Label(ex_frame,text="Job board URL:",font=font_bold).pack(side="left")
 ttk.Entry(ex_frame,textvariable=url_var,width=46).pack(side="left",padx=(4,6))
 def auto_extract():
-    url=url_var.get().strip(); res=None
-    m=re.match(r"https?://boards\.greenhouse\.io/([^/]+)/?",url)
-    if m: slug=m.group(1); name_var.set(slug.capitalize()); ats_var.set("Greenhouse"); fields["slug"].set(slug); res="Greenhouse"
-    m=re.match(r"https?://jobs\.lever\.co/([^/]+)/?",url)
-    if m: slug=m.group(1); name_var.set(slug.capitalize()); ats_var.set("Lever"); fields["slug"].set(slug); res="Lever"
-    m=re.match(r"https?://([^/]+)\.ashbyhq\.com/job_board/([^/]+)",url)
-    if m: slug=m.group(2); name_var.set(slug.capitalize()); ats_var.set("Ashby"); fields["slug"].set(slug); res="Ashby"
-    m=re.match(r"https?://([^.]+)\.([^.]+)\.myworkdayjobs\.com/([^/]+)?/?([^/?#]+)?",url)
-    if m:
-        tenant,cluster,p3,p4=m.groups(); site="External"; locale="en-US"
-        if p4 and p3: locale=p3; site=p4
-        elif p3: site=p3
-        name_var.set(tenant.upper()); ats_var.set("Workday")
-        fields["tenant"].set(tenant); fields["cluster"].set(cluster)
-        fields["site"].set(site); fields["locale"].set(locale); res="Workday"
+    hit=classify_url(url_var.get()); res=None
+    if hit:
+        name,info=hit; res=info["ats"]
+        name_var.set(name); ats_var.set(res)
+        for k,v in info.items():
+            if k in fields: fields[k].set(v)
     status.config(text=f"✔ Detected {res}" if res else "❌ Unknown URL")
     root.after(2500,lambda:status.config(text="Ready"))
 ttk.Button(ex_frame,text="Auto Detect",command=auto_extract,style="TButton").pack(side="left")
 
+def bulk_import_click():
+    path=filedialog.askopenfilename(title="File with one job-board URL per line",
+                                    filetypes=(("Text / CSV","*.txt *.csv"),("All files","*.*")))
+    if not path: return
+    with open(path,encoding="utf-8-sig") as f: urls=read_urls(f)
+    def runner():
+        status.config(text=f"⚡ probing {len(urls)} URLs …")
+        add_alert(f"[BULK] {len(urls)} URLs from {pathlib.Path(path).name}")
+        try:
+            report=bulk_import(urls,CFG)
+            add_alert(format_report(report))
+            status.config(text=f"✔ {sum(r['status']=='ok' for r in report)} boards added")
+        except Exception as e:
+            add_alert(f"[BULK] failed: {e}"); status.config(text="⚠ bulk import error")
+        refresh_tree(); root.after(3000,lambda:status.config(text="Ready"))
+    threading.Thread(target=runner,daemon=True).start()
+ttk.Button(ex_frame,text="Bulk import…",command=bulk_import_click,style="TButton")\
+   .pack(side="left",padx=(6,0))
+
 # ╔═════ Windows Task-Scheduler automation panel ═════╗
 def is_windows(): return platform.system().lower().startswith("win")
 def task_exists(): return is_windows() and subprocess.run(
@@ -374,24 +384,25 @@ def refresh_tree():
     exp={i:tree.item(i,"open") for i in tree.get_children()}
     tree.delete(*tree.get_children()); company_roles.clear()
     seen=load_seen()
+    all_jobs=load_jobs()
     for idx,(name,info) in enumerate(load_cfg().items()):
         tag=("odd",) if idx%2 else ()
-        jobs=json.loads(JOBS_F.read_text()).get(name,[]) if JOBS_F.exists() else []
+        jobs=[Posting.from_dict(j,name) for j in all_jobs.get(name,[])]
         company_roles[name]=jobs
-        new_present=any(str(j["id"]) not in seen for j in jobs)
+        new_present=any(j.id not in seen for j in jobs)
         comp_tag=f"{name}_tag"
         tree.tag_configure(comp_tag,foreground="#39FF14" if new_present else "#f0f0f0",
                            font=("Segoe UI",11,"bold"))
         parent=tree.insert("", "end", iid=name, values=("",name,len(jobs)),
                            tags=(comp_tag,)+tag, open=exp.get(name,False))
         for j in jobs:
-            jid=str(j["id"]); new=jid not in seen
+            jid=j.id; new=jid not in seen
             dot="\u25CF" if new else ""
             dtag,titag=f"d{jid}",f"t{jid}"
             tree.tag_configure(dtag,foreground="#39FF14" if new else "#f0f0f0")
             tree.tag_configure(titag,foreground="#39FF14" if new else "#f0f0f0")
             tree.insert(parent,"end",iid=f"{name}::{jid}",
-                        values=(dot,j["title"],""), tags=(dtag,titag)+tag)
+                        values=(dot,j.title,""), tags=(dtag,titag)+tag)
 
 # ────────────────── core actions ──────────────────
 def add_alert(msg):
@@ -399,11 +410,17 @@ def add_alert(msg):
     alert_console.see("end"); alert_console.config(state="disabled")
 
 def acknowledge_all():
-    ids={str(j["id"]) for jobs in company_roles.values() for j in jobs}
+    ids={j.id for jobs in company_roles.values() for j in jobs}
     save_seen(load_seen()|ids); refresh_tree()
     status.config(text="✔ marked seen"); root.after(2000,lambda:status.config(text="Ready"))
 def clear_seen(): SEEN_F.write_text("[]"); refresh_tree(); status.config(text="✔ seen cleared")
-def clear_notified(): NOTIFIED_F.write_text("[]"); status.config(text="✔ notified cleared")
+def clear_notified():
+    NOTIFIED_F.write_text("[]")
+    if SHARD_F.exists():                              # sharded: dedup lives in the lease store
+        import shards
+        store=shards.LeaseStore(shards.load_config(SHARD_F)["db"])
+        store.notified().clear(); store.close()
+    status.config(text="✔ notified cleared")
 for b,f in ((ack_btn,acknowledge_all),(clr_btn,clear_seen),(clear_notified_btn,clear_notified)):
     b.config(command=lambda fn=f: (fn(), root.after(2000,lambda:status.config(text="Ready"))))
 
@@ -411,8 +428,8 @@ for b,f in ((ack_btn,acknowledge_all),(clr_btn,clear_seen),(clear_notified_btn,c
 tree.bind("<Double-1>",lambda e: (
     sel:=tree.selection(),
     webbrowser.open(
-        next((j["url"] for c in [sel[0].split("::")[0]]
-              for j in company_roles.get(c,[]) if sel[0].endswith(str(j["id"]))),""),
+        next((j.url for c in [sel[0].split("::")[0]]
+              for j in company_roles.get(c,[]) if sel[0]==f"{c}::{j.id}"),""),
         new=2)
     )[0] if tree.selection() else None)
 
@@ -453,19 +470,57 @@ def test_fetch_any():
     cfg=load_cfg()
     for name,info in cfg.items():
         try:
-            cls={"Greenhouse":GreenhouseProvider,"Lever":LeverProvider,"Ashby":AshbyProvider,
-                 "Workday":WorkdayProvider,"WorkdayIntercept":WorkdayInterceptProvider}[info["ats"]]
-            if info["ats"] in ("Greenhouse","Lever","Ashby"):
-                prov=cls(info["slug"],extra_filter=lambda _:True)
-            else:
-                prov=cls(tenant=info["tenant"],cluster=info["cluster"],
-                         site=info["site"],locale=info["locale"],extra_filter=lambda _:True)
-            num=len(list(prov.fetch()))
+            prov=build_provider(name,info,extra_filter=lambda _:True)
+            num=sum(1 for _ in prov.fetch())
             alert_console.insert("end",f"{name}: {'YES' if num else 'NO'} ({num})\n")
         except Exception as e: alert_console.insert("end",f"{name}: ERROR {e}\n")
     alert_console.insert("end","====================\n"); alert_console.config(state="disabled")
 test_btn.config(command=lambda: threading.Thread(target=test_fetch_any,daemon=True).start())
 
+# slowest boards (latest metrics.jsonl record per watcher)
+def load_metrics():
+    latest={}
+    for f in (METRICS_F.with_suffix(".jsonl.1"),METRICS_F):   # rolled-over file first
+        if not f.exists(): continue
+        for line in f.read_text(encoding="utf-8").splitlines():
+            try: d=json.loads(line)
+            except json.JSONDecodeError: continue
+            latest[d.get("watcher","")]=d
+    return latest
+
+SLOW_COLS=(("watcher","Board",160),("ats","ATS",90),("wall_s","Wall (s)",70),
+           ("tier","Tier",70),("requests","Req",50),("bytes","Bytes",80),
+           ("retries","Retries",60),("rows_fetched","Fetched",65),
+           ("rows_matched","Matched",65),("errors","Errors",60))
+def show_slowest():
+    rows=list(load_metrics().values())
+    if not rows: messagebox.showinfo("Slowest boards","No metrics yet – run a check first"); return
+    win=tk.Toplevel(root); win.title("Slowest boards"); win.configure(bg="#232323")
+    win.geometry("860x460")
+    tv=ttk.Treeview(win,columns=[c for c,_,_ in SLOW_COLS],show="headings")
+    tv.pack(fill="both",expand=True,padx=10,pady=10)
+    def cell(r,c):
+        v=r.get(c,"")
+        return len(v) if isinstance(v,list) else v
+    order={"key":"wall_s","desc":True}
+    def fill():
+        tv.delete(*tv.get_children())
+        num=order["key"] not in ("watcher","ats","tier")
+        rows.sort(key=lambda r:(cell(r,order["key"]) or 0) if num else str(cell(r,order["key"])),
+                  reverse=order["desc"])
+        for i,r in enumerate(rows):
+            tv.insert("","end",values=[cell(r,c) for c,_,_ in SLOW_COLS],
+                      tags=("odd",) if i%2 else ())
+    def sort_by(c):
+        order["desc"]=not order["desc"] if order["key"]==c else True
+        order["key"]=c; fill()
+    for c,label,w in SLOW_COLS:
+        tv.heading(c,text=label,command=lambda c=c:sort_by(c))
+        tv.column(c,width=w,anchor="w" if c=="watcher" else "center")
+    tv.tag_configure("odd",background="#1a1a1a")
+    fill()
+slow_btn.config(command=show_slowest)
+
 # initial load & periodic refresh
 def load_last_check():
     if LAST_CHECK_F.exists(): last_check_var.set("Last check: "+LAST_CHECK_F.read_text())